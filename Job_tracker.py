@@ -1,28 +1,30 @@
 import streamlit as st
 from src.analytics import analytics_ui
-from src.database import init_db
+from src.database import close_db, init_db
 from src.job_application import JobApplicationForm, JobManager
 
 
 def main():
     session = init_db()
+    try:
+        st.title("📊 Job Application Tracker")
+        menu = [
+            "Add Job Application",
+            "View & Update Applications",
+            "Analytics Dashboard",
+        ]
+        choice = st.sidebar.selectbox("Select Option", menu)
 
-    st.title("📊 Job Application Tracker")
-    menu = [
-        "Add Job Application",
-        "View & Update Applications",
-        "Analytics Dashboard",
-    ]
-    choice = st.sidebar.selectbox("Select Option", menu)
-
-    if choice == "Add Job Application":
-        job_form = JobApplicationForm(session)
-        job_form.add_job_ui()
-    elif choice == "View & Update Applications":
-        job_manager = JobManager(session)
-        job_manager.view_update_ui()
-    elif choice == "Analytics Dashboard":
-        analytics_ui(session)
+        if choice == "Add Job Application":
+            job_form = JobApplicationForm(session)
+            job_form.add_job_ui()
+        elif choice == "View & Update Applications":
+            job_manager = JobManager(session)
+            job_manager.view_update_ui()
+        elif choice == "Analytics Dashboard":
+            analytics_ui(session)
+    finally:
+        close_db()
 
 
 if __name__ == "__main__":
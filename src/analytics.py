@@ -138,37 +138,60 @@
 #     else:
 #         st.write("No upcoming follow-ups.")
 
+import logging
+
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from src.database import fetch_all_jobs
+from src.database import read_jobs
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_SCALES = {
+    "Salmon": [
+        [0.0, "rgb(255, 229, 229)"],
+        [0.5, "rgb(255, 160, 122)"],
+        [1.0, "rgb(233, 87, 63)"],
+    ],
+    "Cool": [
+        [0.0, "rgb(0, 255, 255)"],
+        [0.5, "rgb(127, 127, 255)"],
+        [1.0, "rgb(255, 0, 255)"],
+    ],
+    "Plasma": "plasma",
+    "Sunset": "sunset",
+    "Viridis": "viridis",
+    "Inferno": "inferno",
+    "Magma": "magma",
+    "Turbo": "turbo",
+    "cyan": [
+        [0.0, "rgb(224, 255, 255)"],
+        [0.5, "rgb(0, 255, 255)"],
+        [1.0, "rgb(0, 139, 139)"],
+    ],
+}
+
+# Only the columns the dashboard panels read
+ANALYTICS_COLUMNS = ("date_applied", "company_name", "job_title", "status", "follow_up_date", "notes", "priority")
+
+# Status -> (emoji, Streamlit callout) for the Personalized Insights panel
+INSIGHT_STYLES = {
+    "Offer Received": ("🎉", st.success),
+    "Interview Scheduled": ("🗓️", st.info),
+    "Ghosted": ("👻", st.warning),
+    "Rejected": ("💔", st.error),
+}
+
+
+# Shared across reruns so changing a dashboard filter doesn't re-read the table;
+# cleared by the job pages after every write they make. Database errors propagate so a failed read is never cached.
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_fetch_all_jobs(_conn):
+    return read_jobs(_conn, ANALYTICS_COLUMNS)
 
 
 def get_colorscale(name):
-    custom_scales = {
-        "Salmon": [
-            [0.0, "rgb(255, 229, 229)"],
-            [0.5, "rgb(255, 160, 122)"],
-            [1.0, "rgb(233, 87, 63)"],
-        ],
-        "Cool": [
-            [0.0, "rgb(0, 255, 255)"],
-            [0.5, "rgb(127, 127, 255)"],
-            [1.0, "rgb(255, 0, 255)"],
-        ],
-        "Plasma": "plasma",
-        "Sunset": "sunset",
-        "Viridis": "viridis",
-        "Inferno": "inferno",
-        "Magma": "magma",
-        "Turbo": "turbo",
-        "cyan": [
-            [0.0, "rgb(224, 255, 255)"],
-            [0.5, "rgb(0, 255, 255)"],
-            [1.0, "rgb(0, 139, 139)"],
-        ],
-    }
-    return custom_scales.get(name, "viridis")
+    return CUSTOM_SCALES.get(name, "viridis")
 
 
 def plot_bar(df, x, y, title, color_col=None, orientation="v", color_map="Viridis"):
@@ -186,12 +209,11 @@ def plot_bar(df, x, y, title, color_col=None, orientation="v", color_map="Viridi
 class JobAnalyticsEngine:
     def __init__(self, conn):
         self.conn = conn
-        self.df = fetch_all_jobs(self.conn)
+        self.df = _cached_fetch_all_jobs(self.conn)
         self.filtered_df = pd.DataFrame()
         self.status_counts = pd.DataFrame()
 
     def apply_filters(self, status_filter, priority_filter, date_range):
-        self.df["date_applied"] = pd.to_datetime(self.df["date_applied"])
         self.filtered_df = self.df[
             self.df["status"].isin(status_filter)
             & self.df["priority"].isin(priority_filter)
@@ -208,21 +230,11 @@ class JobAnalyticsEngine:
 
     def show_insights(self):
         with st.expander("💡 Personalized Insights", expanded=True):
-            for label, emoji in {
-                "Offer Received": "🎉",
-                "Interview Scheduled": "🗓️",
-                "Ghosted": "👻",
-                "Rejected": "💔",
-            }.items():
-                if label in self.status_counts["Status"].to_numpy():
-                    count = self.status_counts.query(f"Status == '{label}'")["Count"].sum()
-                    if count:
-                        func = (
-                            st.success
-                            if label == "Offer Received"
-                            else (st.info if label == "Interview Scheduled" else (st.warning if label == "Ghosted" else st.error))
-                        )
-                        func(f"{emoji} {count} {label}(s)")
+            counts = dict(zip(self.status_counts["Status"], self.status_counts["Count"], strict=True))
+            for label, (emoji, callout) in INSIGHT_STYLES.items():
+                count = counts.get(label)
+                if count:
+                    callout(f"{emoji} {count} {label}(s)")
 
     def show_status_priority(self):
         with st.expander("📌 Application Status & Priorities"):
@@ -273,13 +285,8 @@ class JobAnalyticsEngine:
 
     def show_followups(self):
         with st.expander("⏱️ Follow-up Metrics"):
-            self.filtered_df["follow_up_date"] = pd.to_datetime(self.filtered_df["follow_up_date"], errors="coerce")
-            self.filtered_df["time_to_follow_up"] = (
-                self.filtered_df["follow_up_date"] - self.filtered_df["date_applied"]
-            ).dt.days
-            followup = (
-                self.filtered_df.dropna(subset=["time_to_follow_up"]).groupby("status")["time_to_follow_up"].mean().reset_index()
-            )
+            days = (self.filtered_df["follow_up_date"] - self.filtered_df["date_applied"]).dt.days
+            followup = days.rename("time_to_follow_up").groupby(self.filtered_df["status"]).mean().dropna().reset_index()
             st.plotly_chart(
                 plot_bar(
                     followup,
@@ -339,14 +346,10 @@ class JobAnalyticsEngine:
 
     def show_heatmap(self):
         with st.expander("📅 Heatmap of Applications"):
-            heatmap = self.filtered_df.copy()
-            heatmap["month_applied"] = heatmap["date_applied"].dt.to_period("M").astype(str)
-            pivot = heatmap.pivot_table(
-                index="month_applied",
-                columns="status",
-                aggfunc="size",
-                fill_value=0,
-            ).T
+            pivot = pd.crosstab(
+                self.filtered_df["status"],
+                self.filtered_df["date_applied"].dt.to_period("M").astype(str).rename("month_applied"),
+            )
             st.plotly_chart(
                 px.imshow(
                     pivot,
@@ -360,9 +363,8 @@ class JobAnalyticsEngine:
     def show_reminders(self):
         with st.expander("🔔 Follow-up Reminders & Recents"):
             today = pd.to_datetime("today").normalize()
-            self.filtered_df["follow_up_date"] = pd.to_datetime(self.filtered_df["follow_up_date"], errors="coerce")
             upcoming = self.filtered_df[self.filtered_df["follow_up_date"] >= today]
-            recent = self.filtered_df.sort_values(by="date_applied", ascending=False).head(5)
+            recent = self.filtered_df.nlargest(5, "date_applied")
 
             col1, col2 = st.columns(2)
             col1.markdown("**📬 Upcoming Follow-ups**")
@@ -375,20 +377,29 @@ class JobAnalyticsEngine:
                             "follow_up_date",
                             "notes",
                         ]
-                    ]
+                    ],
+                    column_config={"follow_up_date": st.column_config.DateColumn()},
                 )
                 if not upcoming.empty
                 else col1.write("No upcoming follow-ups.")
             )
 
             col2.markdown("**🕑 Recent Applications**")
-            col2.dataframe(recent[["company_name", "job_title", "date_applied", "status"]])
+            col2.dataframe(
+                recent[["company_name", "job_title", "date_applied", "status"]],
+                column_config={"date_applied": st.column_config.DateColumn()},
+            )
 
 
 def analytics_ui(conn):
     st.subheader("📊 Analytics Dashbaord")
 
-    engine = JobAnalyticsEngine(conn)
+    try:
+        engine = JobAnalyticsEngine(conn)
+    except Exception as e:
+        logger.exception("Database error while fetching job applications")
+        st.error(f"Database error: {e}")
+        return
 
     if engine.df.empty:
         st.warning("No applications yet! Add some to see insights.")
@@ -86,63 +86,137 @@
 #         st.error(f"Database error: {e}")
 
 import logging
+import sys
+from contextlib import closing
 
 import pandas as pd
-import streamlit as st
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import scoped_session, sessionmaker
 from src.model import Job, engine
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create a session factory
-Session = sessionmaker(bind=engine)
+# Create a thread-scoped session factory: each Streamlit script run gets one session, released by close_db().
+# Objects stay loaded after commit, so reading them back doesn't trigger another SELECT.
+Session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+# Columns accepted from the add-job form and bulk imports
+JOB_FIELDS = (
+    "date_applied",
+    "company_name",
+    "job_title",
+    "location",
+    "job_link",
+    "status",
+    "follow_up_date",
+    "interview_date",
+    "recruiter_contact",
+    "networking_contact",
+    "notes",
+    "priority",
+)
+# Dates are kept as datetime64 so filters and date arithmetic compare natively instead of per-row date objects
+DATETIME_COLUMNS = ("date_applied", "follow_up_date", "interview_date", "created_at", "updated_at")
+
+SELECT_ALL_JOBS = "SELECT * FROM jobs"
 
 
 def init_db():
     return Session()
 
 
+# Close the current run's session and hand its connection back to the pool
+def close_db():
+    Session.remove()
+
+
+# Show an error in the Streamlit UI when running inside the app (callers already log it).
+# Streamlit is looked up rather than imported so scripts using these helpers don't load it.
+def _ui_error(message):
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        st.error(message)
+
+
 # Insert a new job application into the database
 def add_job_application(session, data):
     try:
-        new_job = Job(
-            date_applied=data["date_applied"],
-            company_name=data["company_name"],
-            job_title=data["job_title"],
-            location=data["location"],
-            job_link=data["job_link"],
-            status=data["status"],
-            follow_up_date=data["follow_up_date"],
-            interview_date=data["interview_date"],
-            recruiter_contact=data["recruiter_contact"],
-            networking_contact=data["networking_contact"],
-            notes=data["notes"],
-            priority=data["priority"],
-        )
+        new_job = Job(**{column: data[column] for column in JOB_FIELDS})
         session.add(new_job)
         session.commit()
         logger.info("Job application added successfully.")
     except Exception as e:
         logger.exception("An error occurred while adding job application")
-        st.error(f"An error occurred: {e}")
+        _ui_error(f"An error occurred: {e}")
 
 
-# Fetch all job applications
-def fetch_all_jobs(session):
+# Insert many job applications in a single transaction (one executemany, one commit)
+def add_job_applications_bulk(session, rows):
+    if not rows:
+        return
     try:
-        return pd.read_sql(session.query(Job).statement, session.bind)
+        if session.get_bind().dialect.name == "sqlite" and not session.connection().connection.dbapi_connection.in_transaction:
+            # Take the write lock up front rather than upgrading a deferred transaction mid-insert;
+            # if the caller already has writes pending, insert inside their transaction instead
+            session.execute(text("BEGIN IMMEDIATE"))
+        session.execute(insert(Job), [{column: row[column] for column in JOB_FIELDS} for row in rows])
+        session.commit()
+        logger.info("%d job applications added successfully.", len(rows))
+    except Exception as e:
+        session.rollback()
+        logger.exception("An error occurred while adding job applications in bulk")
+        _ui_error(f"An error occurred: {e}")
+
+
+# Read all job applications (optionally only some columns), letting database errors propagate; reads the raw
+# DBAPI cursor and parses dates per column, skipping SQLAlchemy's per-row result processing on large tables
+def read_jobs(session, columns=None):
+    table = Job.__table__
+    query = str(select(*(table.c[column] for column in columns))) if columns else SELECT_ALL_JOBS
+    with closing(session.connection().connection.cursor()) as cursor:
+        cursor.execute(query)
+        jobs = pd.DataFrame.from_records(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+    for column in jobs.columns.intersection(DATETIME_COLUMNS):
+        jobs[column] = pd.to_datetime(jobs[column], format="ISO8601")
+    return jobs
+
+
+# Fetch all job applications (optionally only some columns); errors are reported and give an empty frame
+def fetch_all_jobs(session, columns=None):
+    try:
+        jobs = read_jobs(session, columns)
     except Exception as e:
         logger.exception("Database error while fetching job applications")
-        st.error(f"Database error: {e}")
+        _ui_error(f"Database error: {e}")
         return pd.DataFrame()
+    else:
+        return jobs
+
+
+# Check whether a job link is already stored; a LIMIT 1 lookup served by the job_link UNIQUE index
+def job_link_exists(session, job_link):
+    try:
+        return session.execute(select(Job.id).where(Job.job_link == job_link).limit(1)).first() is not None
+    except Exception as e:
+        logger.exception("Database error while checking job link")
+        _ui_error(f"Database error: {e}")
+        return False
+
+
+# Stream job applications (optionally only some columns) in chunks instead of building a DataFrame.
+# Errors propagate: a stream cut short must not look like a complete one to an export.
+def iter_jobs(session, columns=None):
+    table = Job.__table__
+    stmt = select(*(table.c[column] for column in columns)) if columns else select(table)
+    yield from session.execute(stmt.execution_options(yield_per=1000))
 
 
 # Update a job application by ID
 def update_job_application(session, application_id, updated_data):
     try:
-        job = session.query(Job).filter_by(id=application_id).one()
+        job = session.get_one(Job, application_id)
         job.status = updated_data["status"]
         job.follow_up_date = updated_data["follow_up_date"]
         job.interview_date = updated_data["interview_date"]
@@ -151,16 +225,30 @@ def update_job_application(session, application_id, updated_data):
         logger.info("Job application %s updated successfully.", application_id)
     except Exception as e:
         logger.exception("Database error while updating job application")
-        st.error(f"Database error: {e}")
+        _ui_error(f"Database error: {e}")
 
 
 # Delete a job application by ID
 def delete_job_application(session, application_id):
     try:
-        job = session.query(Job).filter_by(id=application_id).one()
+        job = session.get_one(Job, application_id)
         session.delete(job)
         session.commit()
         logger.info("Job application %s deleted successfully.", application_id)
     except Exception as e:
         logger.exception("Database error while deleting job application")
-        st.error(f"Database error: {e}")
+        _ui_error(f"Database error: {e}")
+
+
+# Delete several job applications with a single DELETE ... WHERE id IN (...)
+def delete_job_applications(session, application_ids):
+    if not application_ids:
+        return
+    try:
+        session.execute(delete(Job).where(Job.id.in_(application_ids)))
+        session.commit()
+        logger.info("Job applications %s deleted successfully.", application_ids)
+    except Exception as e:
+        session.rollback()
+        logger.exception("Database error while deleting job applications")
+        _ui_error(f"Database error: {e}")
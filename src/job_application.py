@@ -1,15 +1,72 @@
+import html
+import logging
 import re
+import time
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from src.database import (
     add_job_application,
     delete_job_application,
-    fetch_all_jobs,
+    job_link_exists,
+    read_jobs,
     update_job_application,
 )
 
+logger = logging.getLogger(__name__)
+
+STATUS_CHOICES = ("Applied", "Interview Scheduled", "Offer Received", "Rejected", "Ghosted")
+STATUS_INDEX = {status: index for index, status in enumerate(STATUS_CHOICES)}
+STATUS_FILTER_CHOICES = ("All", *STATUS_CHOICES)
+PRIORITY_CHOICES = ("High", "Medium", "Low")
+# User-entered columns interpolated into the job card HTML
+CARD_TEXT_COLUMNS = ("company_name", "job_title", "job_link", "notes")
+URL_PATTERN = re.compile(
+    r"^(https?|ftp):\/\/"
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"
+    r"localhost|"
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|"
+    r"\[?[A-F0-9]*:[A-F0-9:]+\]?)?"
+    r"(?::\d+)?"
+    r"(?:\/[^\s]*)?$",
+    re.IGNORECASE,
+)
+
+
+# Jobs read shared across reruns; every add/update/delete made through the app clears all cached data
+# (this and the analytics read), the TTL only bounds staleness from writes made outside it.
+# Database errors propagate out of the cache so a failed read is never stored.
+# Also returns the lower-cased "company\ntitle" text per row, built once per fill so searches don't re-lowercase,
+# an {id: row position} map so loading one application is a dict lookup, and a token identifying this fill
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_fetch_all_jobs(_session):
+    jobs = read_jobs(_session)
+    fetched_at = time.monotonic_ns()
+    if jobs.empty:
+        return jobs, pd.Series(dtype="string[pyarrow]"), {}, fetched_at
+    # Status/priority repeat a handful of values, so filter masks compare small integer codes instead of strings
+    jobs = jobs.astype({"id": "int32", "status": "category", "priority": "category"})
+    # Arrow-backed so the substring search runs in Arrow's compute kernels and the cache (un)pickles a flat buffer
+    search_index = (jobs["company_name"].fillna("") + "\n" + jobs["job_title"].fillna("")).str.lower().astype("string[pyarrow]")
+    id_index = dict(zip(jobs["id"].tolist(), range(len(jobs)), strict=True))
+    return jobs, search_index, id_index, fetched_at
+
+
+# Filtered view memoized per filter inputs, so reruns that don't touch the filters (e.g. paging) skip the mask.
+# Keyed on the jobs fill token, so a refetched frame never pairs with a view computed from an older one.
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_filter_jobs(_jobs, _search_index, fetched_at, search_text, status_filter, date_filter):  # noqa: ARG001
+    # Cheap status/date predicates first; the substring search only scans the rows that survive them
+    mask = _jobs["date_applied"].to_numpy() >= np.datetime64(date_filter)
+    if status_filter != "All":
+        mask &= (_jobs["status"] == status_filter).to_numpy()
+    if not search_text:
+        return _jobs.loc[mask]
+    candidates = _search_index[mask]
+    return _jobs.loc[candidates.index[candidates.str.contains(search_text.lower(), regex=False)]]
+
 
 class JobApplicationForm:
     def __init__(self, session):
@@ -19,22 +76,20 @@ class JobApplicationForm:
         st.markdown("### ➕ Add New Job Application")  # noqa: RUF001
         st.info("Fill the form below to track your job application. You got this! 🚀")
         st.markdown("---")
+        now = datetime.now(tz=timezone.utc)
         with st.form("job_form"):
             col1, col2 = st.columns(2)
             with col1:
-                date_applied = self._get_date_input("📅 Date Applied", datetime.now(tz=timezone.utc))
+                date_applied = self._get_date_input("📅 Date Applied", now)
                 company_name = st.text_input("🏢 Company Name", placeholder="Eg. Google, Amazon...")
                 job_title = st.text_input("💼 Job Title", placeholder="Eg. Data Analyst, Backend Developer...")
                 location = st.text_input("📍 Location", placeholder="Eg. Remote, Bangalore")
                 job_link = st.text_input("🔗 Job Posting Link", placeholder="Paste URL")
-                priority = st.selectbox("⚡ Priority", ["High", "Medium", "Low"])
+                priority = st.selectbox("⚡ Priority", PRIORITY_CHOICES)
 
             with col2:
-                status = st.selectbox(
-                    "📌 Application Status",
-                    ["Applied", "Interview Scheduled", "Offer Received", "Rejected", "Ghosted"],
-                )
-                follow_up_date = self._get_date_input("📬 Follow-up Date", datetime.now(tz=timezone.utc) + timedelta(days=7))
+                status = st.selectbox("📌 Application Status", STATUS_CHOICES)
+                follow_up_date = self._get_date_input("📬 Follow-up Date", now + timedelta(days=7))
                 interview_date = self._get_date_input("🎤 Interview Date", None)
                 recruiter_contact = st.text_input("👤 Recruiter Contact")
                 networking_contact = st.text_input("🧠 Networking Contact")
@@ -94,6 +149,7 @@ class JobApplicationForm:
                 priority,
             )
             add_job_application(self.session, job_data)
+            st.cache_data.clear()
             st.success(f"✅ Application for *{job_title}* at *{company_name}* saved!")
             st.balloons()
 
@@ -111,7 +167,8 @@ class JobApplicationForm:
             errors.append("Follow-up Date cannot be before Date Applied.")
         if interview_date and interview_date < date_applied:
             errors.append("Interview Date cannot be before Date Applied.")
-        if job_link and not self.is_job_link_unique(job_link):
+        # The uniqueness check is the only one that queries the database, so skip it once a cheap check has failed
+        if job_link and not errors and not self.is_job_link_unique(job_link):
             errors.append("Job Link must be unique.")
         return errors
 
@@ -146,43 +203,29 @@ class JobApplicationForm:
         }
 
     def is_valid_url(self, url):
-        url_pattern = re.compile(
-            r"^(https?|ftp):\/\/"
-            r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"
-            r"localhost|"
-            r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|"
-            r"\[?[A-F0-9]*:[A-F0-9:]+\]?)?"
-            r"(?::\d+)?"
-            r"(?:\/[^\s]*)?$",
-            re.IGNORECASE,
-        )
-        return re.match(url_pattern, url) is not None
+        return URL_PATTERN.match(url) is not None
 
     def is_job_link_unique(self, job_link):
-        jobs = fetch_all_jobs(self.session)
-        return jobs[jobs["job_link"] == job_link].empty
+        return not job_link_exists(self.session, job_link)
 
 
 class JobCard:
     def __init__(self, job):
         self.job = job
 
-    def render(self):
-        st.markdown(
-            f"""
+    def html(self):
+        return f"""
             <div class="job-card" style="padding:10px; margin-bottom:10px;
             border-radius:10px; border:1px solid #dee2e6; background-color:white;">
-                <h4 style="margin-bottom:5px;">{self.job.iloc[3]} @ {self.job.iloc[2]}</h4>
+                <h4 style="margin-bottom:5px;">{self.job[3]} @ {self.job[2]}</h4>
                 <div>
-                    <span class="tag-badge {self.job.iloc[6].split()[0]}">{self.job.iloc[6]}</span>
-                    <span style="color: #495057;">📅 {self.job.iloc[1]}</span> |
-                    <a href="{self.job.iloc[5]}" target="_blank">🔗 Job Link</a>
+                    <span class="tag-badge {self.job[6].split()[0]}">{self.job[6]}</span>
+                    <span style="color: #495057;">📅 {self.job[1]:%Y-%m-%d}</span> |
+                    <a href="{self.job[5]}" target="_blank">🔗 Job Link</a>
                 </div>
-                <div style="margin-top:5px; color:#495057;">{self.job.iloc[11]}</div>
+                <div style="margin-top:5px; color:#495057;">{self.job[11]}</div>
             </div>
-        """,
-            unsafe_allow_html=True,
-        )
+        """.strip()
 
 
 class JobManager:
@@ -191,29 +234,30 @@ class JobManager:
 
     def view_update_ui(self):
         st.markdown("## 📋 View, Filter & Manage Job Applications")
-        jobs = fetch_all_jobs(self.session)
+        try:
+            jobs, search_index, id_index, fetched_at = _cached_fetch_all_jobs(self.session)
+        except Exception as e:
+            logger.exception("Database error while fetching job applications")
+            st.error(f"Database error: {e}")
+            return
 
         if jobs.empty:
             st.warning("No applications found. Start adding now!")
             return
 
-        filtered_jobs = self._filter_jobs_ui(jobs)
+        filtered_jobs = self._filter_jobs_ui(jobs, search_index, fetched_at)
         self._display_jobs_ui(filtered_jobs)
-        self._update_delete_ui(jobs)
+        self._update_delete_ui(jobs, id_index)
 
-    def _filter_jobs_ui(self, jobs):
-        with st.expander("🔎 Filter & Search"):
+    def _filter_jobs_ui(self, jobs, search_index, fetched_at):
+        # Filters sit in a form so typing in the search box doesn't rerun the page on every edit
+        with st.expander("🔎 Filter & Search"), st.form("filter_form"):
             search_text = st.text_input("🔍 Search Company or Title", "")
-            status_filter = st.selectbox(
-                "📌 Filter by Status", ["All", "Applied", "Interview Scheduled", "Offer Received", "Rejected", "Ghosted"]
-            )
+            status_filter = st.selectbox("📌 Filter by Status", STATUS_FILTER_CHOICES)
             date_filter = st.date_input("📅 Applications Since", datetime.now(tz=timezone.utc) - timedelta(days=30))
+            st.form_submit_button("🔍 Apply Filters")
 
-        return jobs[
-            (jobs["company_name"].str.contains(search_text, case=False) | jobs["job_title"].str.contains(search_text, case=False))
-            & ((jobs["status"] == status_filter) if status_filter != "All" else True)
-            & (pd.to_datetime(jobs["date_applied"]).dt.date >= date_filter)
-        ]
+        return _cached_filter_jobs(jobs, search_index, fetched_at, search_text, status_filter, date_filter)
 
     def _display_jobs_ui(self, filtered_jobs):
         st.markdown("### 📄 Job Applications")
@@ -241,49 +285,62 @@ class JobManager:
         start_idx = (page - 1) * jobs_per_page
         end_idx = start_idx + jobs_per_page
         current_jobs = filtered_jobs.iloc[start_idx:end_idx]
+        # Escape user text once for the visible page only; the cached frame stays raw for the data grid
+        current_jobs = current_jobs.assign(
+            **{column: current_jobs[column].map(html.escape, na_action="ignore") for column in CARD_TEXT_COLUMNS}
+        )
 
-        for _, job in current_jobs.iterrows():
-            job_card = JobCard(job)
-            job_card.render()
+        # One markdown call for the whole page; cards are joined without blank lines so they stay a single HTML block
+        cards = "\n".join(JobCard(job).html() for job in current_jobs.itertuples(index=False, name=None))
+        if cards:
+            st.markdown(cards, unsafe_allow_html=True)
 
         st.caption(f"Page {page} of {total_pages} | Showing {start_idx + 1}-{min(end_idx, total_jobs)} of {total_jobs} jobs.")
 
-    def _update_delete_ui(self, jobs):
+    def _update_delete_ui(self, jobs, id_index):
         st.subheader("✏️ Update or Delete Application")
-        st.dataframe(jobs)
+        st.dataframe(
+            jobs,
+            column_config={
+                "date_applied": st.column_config.DateColumn(),
+                "follow_up_date": st.column_config.DateColumn(),
+                "interview_date": st.column_config.DateColumn(),
+            },
+        )
 
         application_id = st.number_input("Enter Application ID to Update/Delete", min_value=1)
 
         if st.button("Load Application"):
-            application = jobs[jobs["id"] == application_id]
-            if not application.empty:
+            position = id_index.get(application_id)
+            if position is not None:
+                application = jobs.iloc[[position]]
                 st.write(application)
                 self._render_update_delete_form(application, application_id)
 
     def _render_update_delete_form(self, application, application_id):
         with st.form("update_form"):
-            current_status = application["status"].to_numpy()[0]
-            current_follow_up = pd.to_datetime(application["follow_up_date"].to_numpy()[0])
-            interview_date_val = application["interview_date"].to_numpy()[0]
-            current_notes = application["notes"].to_numpy()[0]
-
-            new_status = st.selectbox(
-                "Update Status",
-                ["Applied", "Interview Scheduled", "Offer Received", "Rejected", "Ghosted"],
-                index=["Applied", "Interview Scheduled", "Offer Received", "Rejected", "Ghosted"].index(current_status),
+            current_status = application["status"].iloc[0]
+            current_follow_up = application["follow_up_date"].iloc[0]
+            interview_date_val = application["interview_date"].iloc[0]
+            current_notes = application["notes"].iloc[0]
+
+            new_status = st.selectbox("Update Status", STATUS_CHOICES, index=STATUS_INDEX[current_status])
+            new_follow_up_date = st.date_input(
+                "Update Follow-up Date", current_follow_up if pd.notna(current_follow_up) else None
             )
-            new_follow_up_date = st.date_input("Update Follow-up Date", current_follow_up)
             new_interview_date = st.date_input(
                 "Update Interview Date",
-                pd.to_datetime(interview_date_val) if pd.notna(interview_date_val) else datetime.now(tz=timezone.utc),
+                interview_date_val if pd.notna(interview_date_val) else datetime.now(tz=timezone.utc),
             )
             new_notes = st.text_area("Update Notes", current_notes)
 
-            if st.form_submit_button("Update Application"):
-                self._update_application(application_id, new_status, new_follow_up_date, new_interview_date, new_notes)
+            action = st.radio("Action", ["Update Application", "Delete Application"], horizontal=True)
 
-            if st.form_submit_button("Delete Application"):
-                self._delete_application(application_id)
+            if st.form_submit_button("Apply"):
+                if action == "Update Application":
+                    self._update_application(application_id, new_status, new_follow_up_date, new_interview_date, new_notes)
+                else:
+                    self._delete_application(application_id)
 
     def _update_application(self, application_id, new_status, new_follow_up_date, new_interview_date, new_notes):
         updated_data = {
@@ -293,9 +350,11 @@ class JobManager:
             "notes": new_notes,
         }
         update_job_application(self.session, application_id, updated_data)
+        st.cache_data.clear()
         st.success(f"✅ Application {application_id} updated!")
 
     def _delete_application(self, application_id):
         delete_job_application(self.session, application_id)
+        st.cache_data.clear()
         st.success(f"🗑️ Application {application_id} deleted!")
         st.balloons()
@@ -37,9 +37,11 @@
 # # Create a session factory
 # Session = sessionmaker(bind=engine)
 
+import sqlite3
+from contextlib import closing, suppress
 from datetime import datetime
 
-from sqlalchemy import TIMESTAMP, Column, Date, Enum, Integer, String, Text, create_engine
+from sqlalchemy import TIMESTAMP, Column, Date, Enum, Integer, String, Text, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -70,6 +72,28 @@ class Job(Base):
 # Create SQLite database engine
 engine = create_engine("sqlite:///job_tracker.db")
 
+
+# WAL lets readers carry on while a write commits; synchronous=NORMAL is durable under WAL and drops
+# the fsync per commit. A larger page cache, in-memory temp tables and mmap cut page reads on full scans.
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+# Let SQLite refresh its query planner statistics when a pooled connection is finally closed.
+# Runs before the pool closes the connection, so a dead connection must not replace the original error.
+@event.listens_for(engine, "close")
+def _optimize_sqlite(dbapi_connection, _connection_record):
+    with suppress(sqlite3.Error), closing(dbapi_connection.cursor()) as cursor:
+        cursor.execute("PRAGMA optimize")
+
+
 # Create tables in the database
 Base.metadata.create_all(engine)
 